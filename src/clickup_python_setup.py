@@ -21,14 +21,109 @@ Note: Custom statuses and automations cannot be created via API.
       Create them manually in ClickUp UI after running this script.
 """
 
+import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import logging
+import os
+import sys
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import random
+import hashlib
+import uuid
+import gzip
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
+from types import MappingProxyType
 import yaml
 
+try:
+    from dotenv import load_dotenv
+except ImportError:  # Without python-dotenv, settings must come from the real environment
+    def load_dotenv(*args, **kwargs) -> bool:
+        return False
+
+try:
+    import orjson  # Optional: much faster JSON encode/decode for request/response bodies
+    
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+    
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+    
+    _json_loads = json.loads
+
+# libyaml's C parser is much faster than the pure-Python one; use it when available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def _status_names(statuses: List[Dict]) -> Tuple[str, ...]:
+    """Non-empty, stripped status names from a workflow's config, in config order"""
+    names = (status.get("name", "").strip() for status in statuses)
+    return tuple(name for name in names if name)
+
+# Progress output goes through logging; main() attaches a plain stdout handler
+log = logging.getLogger("clickup_setup")
+
+
+class _SpaceLog:
+    """Progress of one space: held back until the space is the one being shown"""
+    __slots__ = ("records", "live", "lock")
+    
+    def __init__(self, live: bool = False):
+        self.records = []
+        self.live = live  # True once this space's records print as they are logged
+        self.lock = threading.Lock()
+
+
+class _SpaceLogBuffer(logging.Filter):
+    """Holds back records logged inside capture() - including from worker threads
+    started with a copy of the caller's context (see ClickUpAPI.run_concurrently) -
+    so spaces built concurrently print one space at a time, the current one live"""
+    
+    def __init__(self):
+        super().__init__()
+        self._current = contextvars.ContextVar("space_log", default=None)
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        space_log = self._current.get()
+        if space_log is None:
+            return True
+        with space_log.lock:
+            if space_log.live:
+                return True
+            space_log.records.append(record)
+            return False
+    
+    @contextmanager
+    def capture(self, space_log: _SpaceLog):
+        token = self._current.set(space_log)
+        try:
+            yield space_log
+        finally:
+            self._current.reset(token)
+    
+    @staticmethod
+    def go_live(space_log: _SpaceLog):
+        """Print what a space logged so far and let the rest through as it comes
+        (call from outside capture())"""
+        with space_log.lock:
+            for record in space_log.records:
+                logging.getLogger(record.name).handle(record)
+            space_log.records = []
+            space_log.live = True
+
+_space_log_buffer = _SpaceLogBuffer()
+log.addFilter(_space_log_buffer)
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -50,8 +145,39 @@ DEFAULT_SPACE_FEATURES = {
     "portfolios": {"enabled": True},
 }
 
+MAX_RETRIES = 5  # Retries of a request rejected with 429 or a transient error
+CIRCUIT_BREAKER_THRESHOLD = 3  # 5xx/network failures in a row before their retries are switched off
+RETRY_BACKOFF_BASE = 1.0  # Seconds; doubled per attempt, plus jitter
+RETRY_BACKOFF_CAP = 30.0  # Upper bound for a single backoff wait
+TRANSIENT_STATUS_CODES = frozenset({502, 503, 504})  # Gateway errors: request never reached ClickUp
+IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "DELETE"})  # Safe to resend after a network error
+REQUEST_TIMEOUT = 30.0  # Seconds to wait for a response before treating it as a network error
+# Map config field types to ClickUp API field types (read-only: shared by all lists)
+FIELD_TYPE_MAPPING = MappingProxyType({
+    "dropdown": "drop_down",
+    "text": "text",
+    "number": "number",
+    "currency": "currency",
+    "date": "date",
+    "person": "users",
+    "checkbox": "checkbox",
+    "url": "url",
+    "email": "email",
+    "phone": "phone",
+    "location": "location",
+    "rating": "rating",
+    "labels": "labels"
+})
+
+STATE_FILE = ".clickup_state.jsonl"  # Journal of IDs created by earlier runs, relative to the config file
+CONFIG_CACHE_DIR = ".cache"  # Parsed config.yaml snapshots, relative to the config file
+
 class ClickUpConfig:
-    def __init__(self, api_token: str, team_id: str):
+    __slots__ = ("api_token", "team_id", "base_url", "headers", "default_space_features",
+                 "max_concurrency", "requests_per_minute", "http2")
+    
+    def __init__(self, api_token: str, team_id: str, max_concurrency: int = 10,
+                 requests_per_minute: int = 100, http2: bool = False):
         self.api_token = api_token
         self.team_id = team_id
         self.base_url = "https://api.clickup.com/api/v2"
@@ -60,46 +186,279 @@ class ClickUpConfig:
             "Content-Type": "application/json"
         }
         self.default_space_features = DEFAULT_SPACE_FEATURES
+        self.max_concurrency = max_concurrency  # Max in-flight requests across threads
+        self.requests_per_minute = requests_per_minute  # ClickUp per-token rate limit
+        self.http2 = http2  # Multiplex requests over one connection (requires httpx[http2])
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class RateLimiter:
+    """Thread-safe token bucket that never lets more than num_requests through in
+    any period-second window: up to `burst` calls may go back to back, the rest
+    trickle in at (num_requests - burst) per period. Once the server reports its
+    own view of the budget (X-RateLimit-* headers, via update_from_headers()),
+    the refill rate follows that instead, but never exceeds the configured one."""
+    
+    __slots__ = ("capacity", "max_refill_rate", "refill_rate", "tokens", "last_refill", "paused_until", "_lock")
+    
+    def __init__(self, num_requests: int, period: float, burst: int = 1):
+        burst = max(1, min(burst, num_requests - 1)) if num_requests > 1 else 1
+        self.capacity = float(burst)
+        self.max_refill_rate = max(num_requests - burst, 1) / period  # Tokens per second
+        self.refill_rate = self.max_refill_rate
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.paused_until = 0.0  # Monotonic time before which no request may start
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+                self.last_refill = now
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.refill_rate
+            time.sleep(wait)
+    
+    def update_from_headers(self, headers):
+        """Sync with ClickUp's X-RateLimit-Remaining / X-RateLimit-Reset headers"""
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_at = float(headers["X-RateLimit-Reset"])  # Unix timestamp (seconds)
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self.tokens = min(self.tokens, float(remaining))
+            until_reset = reset_at - time.time()
+            if remaining <= 0:
+                self.pause(until_reset)
+            elif until_reset > 0:
+                # Spread what's left of the server's budget evenly over the window; the
+                # floor keeps a nearly-due (or clock-skewed) reset from allowing a burst
+                self.refill_rate = min(self.max_refill_rate, remaining / max(until_reset, 1.0))
+    
+    def pause(self, seconds: float):
+        """Block all callers for the given number of seconds (call with or without the lock)"""
+        if seconds > 0:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
 
 # ============================================================================
 # CLICKUP API WRAPPER
 # ============================================================================
 
 class ClickUpAPI:
+    __slots__ = ("config", "_base_url", "_in_flight", "_consecutive_failures", "_failure_lock",
+                 "_created", "_created_lock", "_list_cache", "_list_cache_lock", "rate_limiter",
+                 "session", "_status_error", "_transport_error", "_body_kwarg")
+    
     def __init__(self, config: ClickUpConfig):
         self.config = config
+        self._base_url = config.base_url.rstrip("/") + "/"
+        # Gate concurrent callers (worker threads) to a bounded number of in-flight requests
+        self._in_flight = threading.BoundedSemaphore(config.max_concurrency)
+        self._consecutive_failures = 0  # Requests that gave up on 429/5xx/network errors in a row
+        self._failure_lock = threading.Lock()
+        self._created = {}  # Hash of endpoint + body -> response of memoized creations made this run
+        self._created_lock = threading.Lock()
+        self._list_cache = {}  # list_id -> GET list/{id} response
+        self._list_cache_lock = threading.Lock()
+        self.rate_limiter = RateLimiter(config.requests_per_minute, 60.0, burst=config.max_concurrency)
+        self.session, self._status_error, self._transport_error = self._create_session()
+        # Pre-encoded JSON bodies are passed as data= (requests) or content= (httpx)
+        self._body_kwarg = "data" if isinstance(self.session, requests.Session) else "content"
     
-    def _request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict:
-        """Make API request with error handling and rate limiting"""
-        url = f"{self.config.base_url}/{endpoint}"
+    def _create_session(self) -> Tuple:
+        """Persistent session so TCP/TLS connections are pooled and kept alive.
+        Returns (session, status_error_type, transport_error_type) for the chosen client."""
+        if self.config.http2:
+            http2_client = self._create_http2_session()
+            if http2_client is not None:
+                return http2_client
         
+        session = requests.Session()
+        session.headers.update(self.config.headers)
+        # Only connection-level failures are retried here; HTTP status handling
+        # (429 etc.) stays in _request so Retry-After is honored in one place.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.config.max_concurrency,
+            max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5),
+        )
+        session.mount("https://", adapter)
+        return session, requests.exceptions.HTTPError, requests.exceptions.RequestException
+    
+    def close(self):
+        """Close pooled connections (requests.Session and httpx.Client both support close)"""
+        self.session.close()
+    
+    def _create_http2_session(self) -> Optional[Tuple]:
+        """Synchronous httpx client multiplexing all worker threads' requests over
+        one HTTP/2 connection, or None if httpx (with the h2 extra) isn't installed"""
         try:
-            if method == "GET":
-                response = requests.get(url, headers=self.config.headers)
-            elif method == "POST":
-                response = requests.post(url, headers=self.config.headers, json=data)
-            elif method == "PUT":
-                response = requests.put(url, headers=self.config.headers, json=data)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=self.config.headers)
-            
-            response.raise_for_status()
-            time.sleep(0.5)  # Rate limiting
+            import httpx
+            import h2  # noqa: F401 - required by httpx for HTTP/2
+        except ImportError:
+            log.warning("⚠️  HTTP/2 requested but httpx[http2] is not installed - using requests")
+            return None
+        
+        # The transport owns the connection pool, so limits/http2 are set on it
+        transport = httpx.HTTPTransport(
+            http2=True,
+            retries=3,  # Connection-level failures only, like the requests adapter
+            limits=httpx.Limits(max_connections=self.config.max_concurrency),
+        )
+        
+        # ALPN may still settle on HTTP/1.1 (e.g. behind a proxy) - say which one was used
+        reported = threading.Event()
+        report_lock = threading.Lock()
+        
+        def report_protocol(response):
+            if reported.is_set():
+                return
+            with report_lock:
+                if not reported.is_set():
+                    reported.set()
+                    log.info("   Connected to ClickUp API over %s", response.http_version)
+        
+        client = httpx.Client(headers=self.config.headers, transport=transport, timeout=REQUEST_TIMEOUT,
+                              event_hooks={"response": [report_protocol]})
+        return client, httpx.HTTPStatusError, httpx.HTTPError
+    
+    def _request(self, method: str, endpoint: str, data: Union[Dict, bytes, None] = None,
+                 headers: Optional[Dict] = None) -> Dict:
+        """Make API request with error handling and rate limiting (safe to call from worker threads).
+        data may be a dict or an already JSON-encoded body."""
+        url = self._base_url + endpoint
+        if data is None:
+            body = {}
+        else:
+            body = {self._body_kwarg: data if isinstance(data, bytes) else _json_dumps(data)}
+        if headers:
+            body["headers"] = headers  # Merged over the session's default headers
+        
+        # Requests carrying an Idempotency-Key (see _create_once) may be resent like GETs
+        resendable = method in IDEMPOTENT_METHODS or bool(headers and "Idempotency-Key" in headers)
+        
+        # While the API looks down, send each request once instead of retrying it on
+        # 5xx/network errors; a 429 is the server pacing us, so it is always waited out
+        retries = 0 if self._circuit_open() else MAX_RETRIES
+        
+        for attempt in range(MAX_RETRIES + 1):
+            can_retry = attempt < retries
+            try:
+                self.rate_limiter.acquire()
+                with self._in_flight:
+                    response = self.session.request(method, url, timeout=REQUEST_TIMEOUT, **body)
+                
+                self.rate_limiter.update_from_headers(response.headers)
+                response.raise_for_status()
+                
+                self._record_outcome(ok=True)
+                if not response.content:
+                    return {}
+                try:
+                    return _json_loads(response.content)
+                except ValueError as e:  # orjson.JSONDecodeError is a ValueError too
+                    log.error("API Error: invalid JSON in response to %s %s: %s\nResponse: %s",
+                              method, endpoint, e, response.text)
+                    return {}
             
-            return response.json() if response.text else {}
-        
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
-                print("Rate limit hit, waiting 60 seconds...")
-                time.sleep(60)
-                return self._request(method, endpoint, data)
-            print(f"API Error: {e}")
-            if hasattr(e.response, 'text'):
-                print(f"Response: {e.response.text}")
-            return {}
-        except requests.exceptions.RequestException as e:
-            print(f"API Error: {e}")
-            return {}
+            except self._status_error as e:
+                status = e.response.status_code
+                if status == 429 and attempt < MAX_RETRIES:
+                    # Wait as long as the server says, and hold back other threads too
+                    wait = self._retry_after(e.response, default=60)
+                    log.warning("Rate limit hit, waiting %g seconds...", wait)
+                    self.rate_limiter.pause(wait)
+                    continue
+                if status in TRANSIENT_STATUS_CODES and can_retry:
+                    # X-RateLimit-Reset is on every response and says nothing about
+                    # when a gateway recovers, so only an explicit Retry-After counts
+                    wait = self._retry_after(e.response, default=self._backoff(attempt), rate_limit_reset=False)
+                    log.warning("API Error %s on %s %s, retrying in %.1f seconds...", status, method, endpoint, wait)
+                    time.sleep(wait)
+                    continue
+                # One log record per error so concurrent threads don't interleave lines
+                message = f"API Error: {e}"
+                if status == 429:
+                    message += f" (giving up after {MAX_RETRIES} retries)"
+                elif status in TRANSIENT_STATUS_CODES:
+                    message += f" (giving up after {retries} retries)"
+                    self._record_outcome(ok=False)
+                if hasattr(e.response, 'text'):
+                    message += f"\nResponse: {e.response.text}"
+                log.error(message)
+                return {}
+            except self._transport_error as e:
+                if resendable and can_retry:
+                    wait = self._backoff(attempt)
+                    log.warning("API Error: %s - retrying in %.1f seconds...", e, wait)
+                    time.sleep(wait)
+                    continue
+                if resendable:
+                    log.error("API Error: %s (giving up after %d retries)", e, retries)
+                else:
+                    log.error("API Error: %s", e)
+                self._record_outcome(ok=False)
+                return {}
+        
+        return {}  # Unreachable: the last attempt always returns or falls into a handler
+    
+    def _circuit_open(self) -> bool:
+        """True once CIRCUIT_BREAKER_THRESHOLD requests in a row have failed"""
+        with self._failure_lock:
+            return self._consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD
+    
+    def _record_outcome(self, ok: bool):
+        """Track consecutive outage-type failures - 5xx/network errors, not 429s
+        (any success closes the circuit)"""
+        with self._failure_lock:
+            if ok:
+                self._consecutive_failures = 0
+                return
+            self._consecutive_failures += 1
+            if self._consecutive_failures == CIRCUIT_BREAKER_THRESHOLD:
+                log.warning("⚠️  %d requests in a row failed - not retrying until one succeeds",
+                            CIRCUIT_BREAKER_THRESHOLD)
+    
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with jitter for the given (0-based) retry attempt"""
+        return min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt) + random.uniform(0, RETRY_BACKOFF_BASE)
+    
+    @staticmethod
+    def _retry_after(response, default: float, rate_limit_reset: bool = True) -> float:
+        """Seconds to wait as advertised by Retry-After, else X-RateLimit-Reset
+        (unless rate_limit_reset is False), else default"""
+        headers = response.headers
+        try:
+            if "Retry-After" in headers:
+                return max(float(headers["Retry-After"]), 0.0)
+            if rate_limit_reset and "X-RateLimit-Reset" in headers:
+                return max(float(headers["X-RateLimit-Reset"]) - time.time(), 0.0)
+        except (TypeError, ValueError):
+            pass
+        return default
+    
+    def run_concurrently(self, func, items: List) -> List:
+        """Apply func to items on a thread pool, returning results in input order.
+        Each call runs in a copy of the caller's context, so its log records are
+        buffered with the caller's space."""
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        workers = min(len(items), self.config.max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, func, item) for item in items]
+            return [future.result() for future in futures]
     
     def create_space(self, name: str) -> str:
         """Create a new space"""
@@ -108,59 +467,109 @@ class ClickUpAPI:
             "multiple_assignees": True,
             "features": self.config.default_space_features,
         }
-        result = self._request("POST", f"team/{self.config.team_id}/space", data)
+        result = self._create_once(f"team/{self.config.team_id}/space", data, memoize=True)
         return result.get("id", "")
     
+    def create_spaces(self, names: List[str]) -> List[str]:
+        """Create several spaces as one batch (ids returned in input order)"""
+        return self.run_concurrently(self.create_space, names)
+    
     def get_spaces(self) -> List[Dict]:
         """Get all spaces"""
         result = self._request("GET", f"team/{self.config.team_id}/space")
         return result.get("spaces", [])
     
+    def get_space_ids(self) -> Optional[set]:
+        """IDs of all spaces in the team, or None if they could not be fetched"""
+        result = self._request("GET", f"team/{self.config.team_id}/space")
+        if "spaces" not in result:
+            return None
+        return {str(space.get("id", "")) for space in result["spaces"]}
+    
+    def get_folder_tree(self, space_id: str) -> Optional[Tuple[set, set]]:
+        """(folder IDs, list IDs) currently in a space, or None if they could not be fetched"""
+        result = self._request("GET", f"space/{space_id}/folder")
+        if "folders" not in result:
+            return None
+        folder_ids, list_ids = set(), set()
+        for folder in result["folders"]:
+            folder_ids.add(str(folder.get("id", "")))
+            list_ids.update(str(lst.get("id", "")) for lst in folder.get("lists", []))
+        return folder_ids, list_ids
+    
+    def get_view_ids(self, space_id: str) -> Optional[set]:
+        """IDs of the views in a space, or None if they could not be fetched"""
+        result = self._request("GET", f"space/{space_id}/view")
+        if "views" not in result:
+            return None
+        return {str(view.get("id", "")) for view in result["views"]}
+    
     def create_folder(self, space_id: str, name: str) -> str:
         """Create a folder in a space"""
         data = {"name": name}
-        result = self._request("POST", f"space/{space_id}/folder", data)
+        result = self._create_once(f"space/{space_id}/folder", data, memoize=True)
         return result.get("id", "")
     
+    def create_folders(self, space_id: str, names: List[str]) -> List[str]:
+        """Create several folders in a space as one batch (ids returned in input order)"""
+        return self.run_concurrently(lambda name: self.create_folder(space_id, name), names)
+    
     def create_list(self, folder_id: str, name: str) -> str:
         """Create a list in a folder"""
         data = {"name": name}
-        result = self._request("POST", f"folder/{folder_id}/list", data)
+        result = self._create_once(f"folder/{folder_id}/list", data, memoize=True)
         return result.get("id", "")
     
-    def create_custom_field(self, list_id: str, field_config: Dict) -> str:
-        """Create a custom field in a list"""
-        # Validate required fields
-        if "name" not in field_config:
-            print(f"      ⚠️  Field config missing 'name': {field_config}")
-            return ""
-        
-        if "type" not in field_config:
-            print(f"      ⚠️  Field config missing 'type': {field_config}")
-            return ""
-        
-        # Debug: Show what we're sending
-        # print(f"      DEBUG: Creating field: {field_config.get('name')}")
-        # print(f"      DEBUG: Field data: {json.dumps(field_config, indent=2)}")
-        
-        result = self._request("POST", f"list/{list_id}/field", field_config)
+    def create_list_from_template(self, folder_id: str, template_id: str, name: str) -> str:
+        """Create a list in a folder from a saved List Template (brings its fields and statuses)"""
+        data = {"name": name}
+        result = self._create_once(f"folder/{folder_id}/list_template/{template_id}", data, memoize=True)
+        return result.get("id") or result.get("list", {}).get("id", "")
+    
+    def create_lists(self, folder_id: str, names: List[str]) -> List[str]:
+        """Create several lists in a folder as one batch (ids returned in input order)"""
+        return self.run_concurrently(lambda name: self.create_list(folder_id, name), names)
+    
+    def create_custom_field(self, list_id: str, field_config: Union[Dict, bytes]) -> str:
+        """Create a custom field in a list (field_config may be pre-encoded JSON)"""
+        field_id, error = self._post_custom_field(list_id, field_config)
+        if error:
+            log.error(error)
+        return field_id
+    
+    def create_custom_fields(self, list_id: str, field_configs: List[Union[Dict, bytes]]) -> List[str]:
+        """Create several custom fields on a list as one batch (ids returned in input order)
+        ClickUp has no bulk field endpoint, so the batch is issued as concurrent
+        requests; failure reports are printed afterwards, in input order, so
+        concurrent failures don't interleave."""
+        results = self.run_concurrently(lambda fc: self._post_custom_field(list_id, fc), field_configs)
+        for _, error in results:
+            if error:
+                log.error(error)
+        return [field_id for field_id, _ in results]
+    
+    def _post_custom_field(self, list_id: str, field_config: Union[Dict, bytes]) -> Tuple[str, str]:
+        """POST a custom field, returning (field_id, error_report) without printing"""
+        result = self._create_once(f"list/{list_id}/field", field_config, memoize=True)
         
         # API returns field data nested under "field" key or directly
         field_data = result.get("field", result) if isinstance(result, dict) else {}
         
         if not field_data or "id" not in field_data:
+            if isinstance(field_config, bytes):
+                field_config = _json_loads(field_config)
             field_name = field_config.get("name", "Unknown")
-            print(f"      ⚠️  Failed to create field: {field_name}")
-            print(f"         Field config: {json.dumps(field_config, indent=2)}")
-            print(f"         API response: {json.dumps(result, indent=2)}")
-            return ""
+            return "", "\n".join([
+                f"      ⚠️  Failed to create field: {field_name}",
+                f"         Field config: {json.dumps(field_config, indent=2)}",
+                f"         API response: {json.dumps(result, indent=2)}",
+            ])
         
-        return field_data.get("id", "")
+        return field_data.get("id", ""), ""
     
     def create_task(self, list_id: str, task_data: Dict) -> str:
         """Create a task in a list"""
-        result = self._request("POST", f"list/{list_id}/task", task_data)
-        return result.get("id", "")
+        return self._create_once(f"list/{list_id}/task", task_data).get("id", "")
     
     def update_task(self, task_id: str, task_data: Dict) -> Dict:
         """Update a task"""
@@ -168,38 +577,81 @@ class ClickUpAPI:
     
     def create_subtask(self, parent_task_id: str, subtask_data: Dict) -> str:
         """Create a subtask"""
-        result = self._request("POST", f"task/{parent_task_id}/subtask", subtask_data)
-        return result.get("id", "")
+        return self._create_once(f"task/{parent_task_id}/subtask", subtask_data).get("id", "")
+    
+    def _create_once(self, endpoint: str, data: Union[Dict, bytes], memoize: bool = False) -> Dict:
+        """POST a creation request tagged with a fresh Idempotency-Key, which _request
+        resends unchanged on every retry of this call (including after a network
+        error). With memoize, an identical creation already made this run returns
+        the same response (for uniquely named entities; two identical tasks are
+        two tasks)."""
+        body = data if isinstance(data, bytes) else _json_dumps(data)
+        key = hashlib.sha256(endpoint.encode("utf-8") + b"\0" + body).hexdigest()
+        if memoize:
+            with self._created_lock:
+                if key in self._created:
+                    return self._created[key]
+        
+        result = self._request("POST", endpoint, body, headers={"Idempotency-Key": str(uuid.uuid4())})
+        if result and memoize:
+            with self._created_lock:
+                self._created[key] = result
+        return result
+    
+    def create_tasks(self, list_id: str, tasks: List[Dict]) -> List[str]:
+        """Create several tasks in a list as one batch (ids returned in input order)"""
+        return self.run_concurrently(lambda task_data: self.create_task(list_id, task_data), tasks)
+    
+    def create_subtasks(self, parent_task_id: str, subtasks: List[Dict]) -> List[str]:
+        """Create several subtasks of one task as one batch (ids returned in input order)"""
+        return self.run_concurrently(lambda subtask_data: self.create_subtask(parent_task_id, subtask_data), subtasks)
+    
+    def get_list(self, list_id: str) -> Dict:
+        """GET a list's details, reusing an earlier successful response for the same list.
+        Nothing this script sends changes a list's statuses, so entries never go stale
+        within a run."""
+        with self._list_cache_lock:
+            if list_id in self._list_cache:
+                return self._list_cache[list_id]
+        
+        result = self._request("GET", f"list/{list_id}")
+        if result:
+            with self._list_cache_lock:
+                self._list_cache[list_id] = result
+        return result
     
     def update_list_statuses(self, list_id: str, statuses: List[Dict]) -> bool:
         """Check if statuses exist in a list (DO NOT CREATE - must be done manually in ClickUp UI)"""
+        return self.report_missing_statuses(self.find_missing_statuses(list_id, _status_names(statuses)))
+    
+    def find_missing_statuses(self, list_id: str, required: Tuple[str, ...]) -> Optional[List[str]]:
+        """Return the required status names a list lacks, or None if the list could not be fetched"""
         try:
-            result = self._request("GET", f"list/{list_id}")
-            
-            if not result:
-                print(f"      ⚠️  Failed to get list info for status check")
-                return False
-            
-            current_statuses = result.get("statuses", [])
-            status_names = [s.get("status", "").strip().lower() for s in current_statuses]
-            
-            missing_statuses = []
-            for status in statuses:
-                status_name = status.get("name", "").strip()
-                if status_name and status_name.lower() not in status_names:
-                    missing_statuses.append(status_name)
-            
-            if missing_statuses:
-                print(f"      ⚠️  WARNING: Custom statuses cannot be created via API!")
-                print(f"         Missing statuses: {', '.join(missing_statuses)}")
-                print(f"         Please create these statuses manually in ClickUp UI before running examples.")
-                return False
-            
-            print(f"      ✓ All required statuses exist")
-            return True
-        except Exception as e:
-            print(f"      ⚠️  Error checking statuses: {e}")
+            result = self.get_list(list_id)
+        except self._transport_error as e:  # requests.RequestException, or httpx.HTTPError over HTTP/2
+            log.warning("      ⚠️  Error fetching list %s: %s", list_id, e)
+            return None
+        if not result:
+            return None
+        
+        existing = {s.get("status", "").strip().lower() for s in result.get("statuses", [])}
+        return [name for name in required if name.lower() not in existing]
+    
+    @staticmethod
+    def report_missing_statuses(missing_statuses: Optional[List[str]]) -> bool:
+        """Print the outcome of find_missing_statuses and return whether the list is ready"""
+        if missing_statuses is None:
+            log.warning("      ⚠️  Failed to get list info for status check")
             return False
+        
+        if missing_statuses:
+            log.warning("      ⚠️  WARNING: Custom statuses cannot be created via API!")
+            log.warning("         Missing statuses: %s", ', '.join(missing_statuses))
+            log.warning("         Please create these statuses manually in ClickUp UI before running examples.")
+            return False
+        
+        log.info("      ✓ All required statuses exist")
+        return True
     
     def create_view(self, space_id: str, view_config: Dict) -> str:
         """Create a view in a space"""
@@ -212,12 +664,12 @@ class ClickUpAPI:
         In practice, automations should be created via the ClickUp UI."""
         # Automations API is limited - this is a placeholder
         # Real implementation would need to use webhooks or the full automation API
-        print(f"      ℹ️  Automation '{automation_config.get('name')}' should be created manually in ClickUp UI")
+        log.info("      ℹ️  Automation '%s' should be created manually in ClickUp UI", automation_config.get('name'))
         return ""
     
     def get_list_statuses(self, list_id: str) -> List[str]:
         """Get all status names for a list"""
-        result = self._request("GET", f"list/{list_id}")
+        result = self.get_list(list_id)
         if result:
             statuses = result.get("statuses", [])
             return [s.get("status", "") for s in statuses]
@@ -228,46 +680,305 @@ class ClickUpAPI:
 # ============================================================================
 
 class WorkspaceBuilder:
+    __slots__ = ("api", "structure", "config", "_state_path", "_state", "_state_lock",
+                 "_custom_fields_config", "_statuses_config", "_views_config", "_list_templates",
+                 "_workflows", "_fields_by_list_type", "_compiled_fields", "statuses_verified",
+                 "_verified_workflows", "_failed_workflows", "skipped_fields",
+                 "skipped_grouped", "counts", "reused")
+    
     def __init__(self, api: ClickUpAPI, config_path: str = "config.yaml"):
         self.api = api
         self.structure = {}
         self.config = self._load_config(config_path)
+        # Keys are derived from names, so the layout is validated first
+        self._validate_spaces(self.config.get("spaces") or [])
+        self._assign_keys(self.config.get("spaces") or [])
+        # IDs of entities created by earlier runs, so re-runs don't duplicate them
+        self._state_path = Path(config_path).parent / STATE_FILE
+        self._state = self._load_state()
+        self._state_lock = threading.Lock()
+        # Config sections looked up once instead of on every list/space
+        self._custom_fields_config = self.config.get("custom_fields") or {}
+        self._validate_custom_fields(self._custom_fields_config)
+        self._statuses_config = self.config.get("statuses") or {}
+        self._views_config = self.config.get("views") or {}
+        self._list_templates = self.config.get("list_templates") or {}  # list_type -> template id
+        self._workflows = self._index_workflows(self._statuses_config)
+        self._fields_by_list_type = self._index_custom_fields(self._custom_fields_config)
+        self._compiled_fields = {}  # list_type -> (formula field names, [(name, encoded body)])
         self.statuses_verified = {}  # Track which spaces have verified statuses
+        self._verified_workflows = set()  # (space_key, workflow_key, template_id) already confirmed
+        self._failed_workflows = set()  # (space_key, workflow_key, template_id) already reported as missing statuses
         self.skipped_fields = []  # Track fields that couldn't be created via API
+        self.skipped_grouped = {}  # Same entries as skipped_fields, as {space: {folder: {list: [skip]}}}
+        self.counts = {"spaces": 0, "folders": 0, "lists": 0}  # Entities in self.structure
+        self.reused = {"spaces": 0, "folders": 0, "lists": 0}  # ...of which came from an earlier run
     
     def _load_config(self, config_path: str) -> Dict:
-        """Load configuration from YAML file"""
+        """Load configuration from YAML file (parsed result cached on disk by mtime/size)"""
         config_file = Path(config_path)
         if not config_file.exists():
             raise FileNotFoundError(f"Config file not found: {config_path}")
         
+        # Cache key changes whenever the YAML file is modified. The snapshot is
+        # JSON (plain data only), so a planted cache file can't execute code.
+        stat = config_file.stat()
+        path_digest = hashlib.sha1(str(config_file.resolve()).encode("utf-8")).hexdigest()[:12]
+        cache_dir = config_file.parent / CONFIG_CACHE_DIR
+        cache_file = cache_dir / f"config-{path_digest}-{stat.st_mtime_ns}-{stat.st_size}.json"
+        
+        if cache_file.exists():
+            try:
+                config = _json_loads(cache_file.read_bytes())
+                if isinstance(config, dict):
+                    return config
+            except (OSError, ValueError):
+                pass  # Corrupt/unreadable cache - fall back to parsing
+        
         with open(config_file, 'r', encoding='utf-8') as f:
-
-            return yaml.safe_load(f)
+            config = yaml.load(f, Loader=YAML_LOADER)
+        if not isinstance(config, dict):
+            # e.g. an empty file (None) or a top-level list
+            raise ValueError(f"Invalid config file {config_path}: expected a mapping of sections, "
+                             f"got {type(config).__name__}")
+        for section in ("custom_fields", "statuses", "views", "list_templates"):
+            if not isinstance(config.get(section) or {}, dict):
+                raise ValueError(f"Invalid config file {config_path}: '{section}' must be a mapping")
+        
+        try:
+            snapshot = json.dumps(config, ensure_ascii=False)
+            if json.loads(snapshot) != config:
+                # e.g. int/bool mapping keys would come back as strings
+                return config
+            cache_dir.mkdir(exist_ok=True)
+            for stale in cache_dir.glob(f"config-{path_digest}-*"):
+                stale.unlink()
+            cache_file.write_text(snapshot, encoding='utf-8')
+        except (OSError, TypeError, ValueError):
+            pass  # Caching is best-effort (e.g. YAML dates aren't JSON-serializable)
+        
+        return config
+    
+    @staticmethod
+    def _validate_spaces(spaces_config):
+        """Reject a spaces/folders/lists layout the build loops can't walk, before any
+        request is sent"""
+        if not isinstance(spaces_config, list):
+            raise ValueError(f"Invalid config: 'spaces' must be a list, got {type(spaces_config).__name__}")
+        problems = []
+        for space_index, space_config in enumerate(spaces_config):
+            path = f"spaces[{space_index}]"
+            if not isinstance(space_config, dict):
+                problems.append(f"{path}: expected a mapping, got {type(space_config).__name__}")
+                continue
+            if not isinstance(space_config.get("name"), str) or not space_config["name"].strip():
+                problems.append(f"space #{space_index + 1} has no name")
+            folders = space_config.get("folders", [])
+            if not isinstance(folders, list):
+                problems.append(f"{path}: 'folders' must be a list")
+                continue
+            for folder_index, folder_config in enumerate(folders):
+                folder_path = f"{path}.folders[{folder_index}]"
+                if not isinstance(folder_config, dict):
+                    problems.append(f"{folder_path}: expected a mapping, got {type(folder_config).__name__}")
+                    continue
+                if not isinstance(folder_config.get("name"), str) or not folder_config["name"].strip():
+                    problems.append(f"{path}: folder #{folder_index + 1} has no name")
+                lists = folder_config.get("lists", [])
+                if not isinstance(lists, list):
+                    problems.append(f"{folder_path}: 'lists' must be a list")
+                    continue
+                for list_index, list_config in enumerate(lists):
+                    if not isinstance(list_config, (str, dict)):
+                        problems.append(f"{folder_path}.lists[{list_index}]: expected a name or a mapping, "
+                                        f"got {type(list_config).__name__}")
+        if problems:
+            raise ValueError("Invalid spaces config:\n  " + "\n  ".join(problems))
+    
+    @staticmethod
+    def _assign_keys(spaces_config: List[Dict]):
+        """Give every space and folder an explicit ``key`` (default: slug of its name),
+        so the build loops read it instead of re-deriving it"""
+        for space_config in spaces_config:
+            space_config.setdefault("key", space_config["name"].lower().replace(" ", "_"))
+            for folder_config in space_config.get("folders", []):
+                folder_config.setdefault("key", folder_config["name"].lower().replace(" ", "_"))
+    
+    @staticmethod
+    def _validate_custom_fields(custom_fields_config: Dict):
+        """Reject field definitions ClickUp would refuse (no name/type, option-less
+        dropdowns, malformed options...) before any request is sent"""
+        problems = []
+        for field_category, fields in custom_fields_config.items():
+            if not isinstance(fields, list):
+                continue
+            for index, field in enumerate(fields):
+                path = f"custom_fields.{field_category}[{index}]"
+                if not isinstance(field, dict):
+                    problems.append(f"{path}: expected a mapping, got {type(field).__name__}")
+                    continue
+                for key in ("name", "type"):
+                    if not field.get(key):
+                        problems.append(f"{path}: missing '{key}'")
+                if not isinstance(field.get("applies_to", []), list):
+                    problems.append(f"{path}: 'applies_to' must be a list of list types")
+                if "precision" in field and not isinstance(field["precision"], int):
+                    problems.append(f"{path}: 'precision' must be a whole number")
+                
+                if field.get("type") in ("dropdown", "labels"):
+                    type_config = field.get("type_config")
+                    options = type_config.get("options") if isinstance(type_config, dict) else field.get("options")
+                    if not options or not isinstance(options, list):
+                        problems.append(f"{path}: {field['type']} field needs a non-empty 'options' list")
+                        continue
+                    for opt_index, opt in enumerate(options):
+                        if isinstance(opt, dict) and not opt.get("name"):
+                            problems.append(f"{path}.options[{opt_index}]: option missing 'name'")
+        if problems:
+            raise ValueError("Invalid custom field config:\n  " + "\n  ".join(problems))
+    
+    def _load_state(self) -> Dict[str, str]:
+        """Replay the {kind:parent_id:name -> id} journal written by earlier runs"""
+        try:
+            journal = self._state_path.read_bytes()
+        except OSError:
+            return {}
+        
+        state = {}
+        for line in journal.splitlines():
+            try:
+                entry = _json_loads(line)
+                state[entry["key"]] = entry["id"]
+            except (ValueError, KeyError, TypeError):
+                continue  # e.g. a line cut short when a run was killed mid-write
+        
+        if journal and not journal.endswith(b"\n"):
+            # Terminate a cut-short last line so the next append starts on its own line
+            try:
+                with open(self._state_path, 'ab') as f:
+                    f.write(b"\n")
+            except OSError:
+                pass
+        
+        return state
+    
+    def _recall(self, kind: str, parent_id: str, name: str) -> str:
+        """ID of an entity created by an earlier run, or empty string"""
+        return self._state.get(f"{kind}:{parent_id}:{name}", "")
+    
+    def _remember(self, kind: str, parent_id: str, name: str, entity_id: str):
+        """Record a newly created entity, appending it to the state journal right away"""
+        if not entity_id:
+            return
+        key = f"{kind}:{parent_id}:{name}"
+        line = _json_dumps({"key": key, "id": entity_id}) + b"\n"
+        with self._state_lock:
+            self._state[key] = entity_id
+            try:
+                with open(self._state_path, 'ab') as f:
+                    f.write(line)
+            except OSError as e:
+                log.warning("      ⚠️  Could not save state file %s: %s", self._state_path, e)
     
     def build_complete_workspace(self):
         """Build the complete workspace structure from YAML config"""
-        print("🚀 Starting ClickUp Workspace Setup...")
-        print(f"   Loading configuration from: config.yaml")
+        log.info("🚀 Starting ClickUp Workspace Setup...")
+        log.info("   Loading configuration from: config.yaml")
         
         # Create Spaces from config
-        print("\n📁 Creating Spaces...")
-        spaces_config = self.config.get("spaces", [])
+        log.info("\n📁 Creating Spaces...")
+        spaces_config = self.config.get("spaces") or []
         
-        for space_config in spaces_config:
+        # Spaces are independent - create the missing ones as one batch
+        team_id = self.api.config.team_id
+        space_ids = [self._recall("space", team_id, sc["name"]) for sc in spaces_config]
+        self._drop_deleted_spaces(spaces_config, space_ids)
+        missing = [i for i, space_id in enumerate(space_ids) if not space_id]
+        created_ids = self.api.create_spaces([spaces_config[i]["name"] for i in missing])
+        for i, space_id in zip(missing, created_ids):
+            space_ids[i] = space_id
+            self._remember("space", team_id, spaces_config[i]["name"], space_id)
+        
+        buildable = []
+        reused_keys = set()  # Spaces recalled from an earlier run rather than created now
+        for i, (space_config, space_id) in enumerate(zip(spaces_config, space_ids)):
             space_name = space_config["name"]
-            space_key = space_config.get("key", space_name.lower().replace(" ", "_"))
-            
-            space_id = self.api.create_space(space_name)
-            print(f"   ✓ {space_name}: {space_id}")
+            if not space_id:
+                # Nothing to build folders/lists/views in - skip follow-up calls
+                log.warning("   ⚠️  Failed to create space: %s", space_name)
+                self.statuses_verified[space_config["key"]] = False
+                continue
             
-            # Build the space structure
-            print(f"\n🏗️  Building {space_name}...")
-            self.structure[space_key] = self._build_space(space_id, space_config, space_key)
+            source = "" if i in missing else " (from previous run)"
+            if i not in missing:
+                reused_keys.add(space_config["key"])
+            log.info("   ✓ %s: %s%s", space_name, space_id, source)
+            buildable.append((space_id, space_config))
+        
+        # The first space prints live; each later one is held back until the
+        # spaces before it are done, then prints what it has and goes live
+        space_logs = [_SpaceLog(live=(i == 0)) for i in range(len(buildable))]
         
-        print("\n✅ Workspace Setup Complete!")
+        def build(index):
+            space_id, space_config = buildable[index]
+            with _space_log_buffer.capture(space_logs[index]):
+                log.info("\n🏗️  Building %s...", space_config["name"])
+                return self._build_space(space_id, space_config, space_config["key"])
+        
+        # Spaces share nothing below the space level, so their structures are built
+        # concurrently; each space's progress is printed as one block, in config order
+        workers = max(1, min(len(buildable), self.api.config.max_concurrency))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(build, range(len(buildable)))
+            try:
+                for index, ((_, space_config), folders) in enumerate(zip(buildable, results)):
+                    if index + 1 < len(space_logs):
+                        _space_log_buffer.go_live(space_logs[index + 1])
+                    self.structure[space_config["key"]] = folders
+                    self.counts["spaces"] += 1
+                    if space_config["key"] in reused_keys:
+                        self.reused["spaces"] += 1
+                    self.counts["folders"] += len(folders)
+                    self.counts["lists"] += sum(len(folder["lists"]) for folder in folders.values())
+            except BaseException:
+                # Don't lose the progress leading up to a failure
+                for space_log in space_logs:
+                    _space_log_buffer.go_live(space_log)
+                raise
+        
+        log.info("\n✅ Workspace Setup Complete!")
         return self.structure
     
+    def _drop_deleted_spaces(self, spaces_config: List[Dict], space_ids: List[str]):
+        """Blank out (in place) recalled space IDs that no longer exist in ClickUp, e.g.
+        spaces deleted in the UI since the last run, so they are created again"""
+        if not any(space_ids):
+            return
+        live_ids = self.api.get_space_ids()
+        if live_ids is None:
+            log.warning("   ⚠️  Could not verify spaces from the previous run - assuming they still exist")
+            return
+        for i, space_id in enumerate(space_ids):
+            if space_id and space_id not in live_ids:
+                log.info("   Space %s (%s) no longer exists - creating it again", spaces_config[i]["name"], space_id)
+                space_ids[i] = ""
+    
+    def _drop_deleted_folders(self, space_id: str, folder_configs: List[Dict], folder_ids: List[str]) -> Optional[set]:
+        """Blank out (in place) recalled folder IDs that no longer exist in the space, and
+        return the IDs of the lists that do (None if nothing needed, or could be, checked)"""
+        if not any(folder_ids):
+            return None
+        tree = self.api.get_folder_tree(space_id)
+        if tree is None:
+            log.warning("   ⚠️  Could not verify folders from the previous run - assuming they still exist")
+            return None
+        live_folder_ids, live_list_ids = tree
+        for i, folder_id in enumerate(folder_ids):
+            if folder_id and folder_id not in live_folder_ids:
+                log.info("   Folder %s (%s) no longer exists - creating it again", folder_configs[i]["name"], folder_id)
+                folder_ids[i] = ""
+        return live_list_ids
+    
     def _build_space(self, space_id: str, space_config: Dict, space_key: str) -> Dict:
         """Build a space with folders and lists from config"""
         folders = {}
@@ -275,47 +986,105 @@ class WorkspaceBuilder:
         
         # Check if space should be skipped
         if space_config.get("status") == "coming_soon":
-            print(f"   ⏭️  Skipping {space_config['name']} - marked as 'coming_soon'")
+            log.info("   ⏭️  Skipping %s - marked as 'coming_soon'", space_config['name'])
             return folders
         
-        for folder_config in space_config.get("folders", []):
+        # Folders in a space are independent - create the missing ones as one batch
+        folder_configs = space_config.get("folders", [])
+        folder_ids = [self._recall("folder", space_id, fc["name"]) for fc in folder_configs]
+        live_list_ids = self._drop_deleted_folders(space_id, folder_configs, folder_ids)
+        missing_folders = [i for i, folder_id in enumerate(folder_ids) if not folder_id]
+        created_ids = self.api.create_folders(space_id, [folder_configs[i]["name"] for i in missing_folders])
+        for i, folder_id in zip(missing_folders, created_ids):
+            folder_ids[i] = folder_id
+            self._remember("folder", space_id, folder_configs[i]["name"], folder_id)
+        
+        for folder_index, (folder_config, folder_id) in enumerate(zip(folder_configs, folder_ids)):
             folder_name = folder_config["name"]
-            folder_key = folder_config.get("key", folder_name.lower().replace(" ", "_"))
-            print(f"   Creating folder: {folder_name}")
+            folder_key = folder_config["key"]
+            if not folder_id:
+                # Nothing to create lists in - skip follow-up calls
+                log.warning("   ⚠️  Failed to create folder: %s", folder_name)
+                all_statuses_ok = False
+                continue
             
-            folder_id = self.api.create_folder(space_id, folder_name)
+            action = "Created" if folder_index in missing_folders else "Reusing"
+            if folder_index not in missing_folders:
+                self._count_reused("folders")
+            log.info("   %s folder: %s", action, folder_name)
             folders[folder_name] = {"id": folder_id, "key": folder_key, "lists": {}}
             
-            # Create lists in the folder
+            # Normalize list configs (both string and dict formats)
+            list_specs = []
             for list_config in folder_config.get("lists", []):
-                # Handle both string and dict formats
                 if isinstance(list_config, str):
-                    list_name = list_config
-                    list_type = "default"
-                    list_description = ""
+                    list_specs.append((list_config, "default"))
                 else:
-                    list_name = list_config.get("name", "Unnamed List")
-                    list_type = list_config.get("type", "default")
-                    list_description = list_config.get("description", "")
-                
-                print(f"      Creating list: {list_name} (type: {list_type})")
-                list_id = self.api.create_list(folder_id, list_name)
-                folders[folder_name]["lists"][list_name] = {
-                    "id": list_id,
-                    "type": list_type
-                }
-                
-                # Add custom fields based on list type
-                self._add_custom_fields(list_id, list_type, space_key, folder_name, list_name)
-                
-                # Check statuses (don't create - must be done manually)
-                status_ok = self._check_statuses(list_id, list_type)
-                if not status_ok:
-                    all_statuses_ok = False
-                
-                time.sleep(0.3)  # Rate limiting per list
+                    list_specs.append((
+                        list_config.get("name", "Unnamed List"),
+                        list_config.get("type", "default"),
+                    ))
+            
+            # Lists in a folder are independent - create the missing ones as one batch
+            list_ids = [self._recall("list", folder_id, name) for name, _ in list_specs]
+            if live_list_ids is not None:
+                for i, list_id in enumerate(list_ids):
+                    if list_id and list_id not in live_list_ids:
+                        log.info("      List %s (%s) no longer exists - creating it again", list_specs[i][0], list_id)
+                        list_ids[i] = ""
+            missing = [i for i, list_id in enumerate(list_ids) if not list_id]
+            created = self.api.run_concurrently(lambda i: self._create_list(folder_id, *list_specs[i]), missing)
+            for i, (list_id, template_id) in zip(missing, created):
+                list_ids[i] = list_id
+                self._remember("list", folder_id, list_specs[i][0], list_id)
+                self._remember("template", folder_id, list_specs[i][0], template_id)
+            
+            # Lists made from a List Template carry its statuses rather than the space's
+            template_ids = [self._recall("template", folder_id, name) for name, _ in list_specs]
             
-            time.sleep(0.5)  # Rate limiting per folder
+            # Start each workflow's status GET now so it overlaps field creation below
+            with ThreadPoolExecutor(max_workers=self.api.config.max_concurrency) as pool:
+                status_checks = {}
+                for (_, list_type), list_id, template_id in zip(list_specs, list_ids, template_ids):
+                    workflow = self._find_workflow(list_type)
+                    if not list_id or not workflow:
+                        continue
+                    workflow_key, required = workflow
+                    check_key = (space_key, workflow_key, template_id)
+                    if check_key in status_checks:
+                        continue
+                    if check_key in self._verified_workflows:
+                        continue
+                    if check_key in self._failed_workflows:
+                        continue
+                    status_checks[check_key] = pool.submit(contextvars.copy_context().run,
+                                                           self.api.find_missing_statuses, list_id, required)
+                
+                for i, ((list_name, list_type), list_id, template_id) in enumerate(zip(list_specs, list_ids, template_ids)):
+                    if not list_id:
+                        # Nothing to attach fields/statuses to - skip follow-up calls
+                        log.warning("      ⚠️  Failed to create list: %s (type: %s)", list_name, list_type)
+                        all_statuses_ok = False
+                        continue
+                    
+                    action = "Created" if i in missing else "Reusing"
+                    if i not in missing:
+                        self._count_reused("lists")
+                    source = f", from template {template_id}" if template_id else ""
+                    log.info("      %s list: %s (type: %s%s)", action, list_name, list_type, source)
+                    folders[folder_name]["lists"][list_name] = {
+                        "id": list_id,
+                        "type": list_type
+                    }
+                    
+                    # Add custom fields based on list type (a template already brought them)
+                    if not template_id:
+                        self._add_custom_fields(list_id, list_type, space_key, folder_name, list_name)
+                    
+                    # Check statuses (don't create - must be done manually)
+                    status_ok = self._check_statuses(list_id, list_type, space_key, status_checks, template_id)
+                    if not status_ok:
+                        all_statuses_ok = False
         
         # Track if all statuses are verified for this space
         self.statuses_verified[space_key] = all_statuses_ok
@@ -328,177 +1097,248 @@ class WorkspaceBuilder:
         
         return folders
     
+    def _count_reused(self, kind: str):
+        """Count an entity recalled from an earlier run (spaces are built concurrently)"""
+        with self._state_lock:
+            self.reused[kind] += 1
+    
+    def _create_list(self, folder_id: str, list_name: str, list_type: str) -> Tuple[str, str]:
+        """Create a list from its type's List Template when one is configured, else blank.
+        Returns (list_id, template_id) - template_id is empty for a blank list."""
+        template_id = str(self._list_templates.get(list_type) or "")
+        if template_id:
+            list_id = self.api.create_list_from_template(folder_id, template_id, list_name)
+            if list_id:
+                return list_id, template_id
+            log.warning("      ⚠️  List template %s failed for %s - creating a blank list", template_id, list_name)
+        return self.api.create_list(folder_id, list_name), ""
+    
     def _add_custom_fields(self, list_id: str, list_type: str, space_key: str = "", folder_name: str = "", list_name: str = ""):
         """Add custom fields to a list based on list type"""
-        custom_fields_config = self.config.get("custom_fields", {})
+        formula_fields, payloads = self._compile_custom_fields(list_type)
         
-        # Collect all applicable fields for this list type
-        applicable_fields = []
-        for field_category, fields in custom_fields_config.items():
-            if isinstance(fields, list):
-                for field in fields:
-                    applies_to = field.get("applies_to", [])
-                    if list_type in applies_to:
-                        applicable_fields.append(field)
+        if formula_fields:
+            # Track skipped fields, grouped by location for the final summary
+            list_skips = (self.skipped_grouped.setdefault(space_key, {})
+                          .setdefault(folder_name, {}).setdefault(list_name, []))
+            for fname in formula_fields:
+                skip = {
+                    "space": space_key,
+                    "folder": folder_name,
+                    "list": list_name,
+                    "type": "formula",
+                    "name": fname,
+                    "reason": "Formula fields must be created manually in ClickUp UI"
+                }
+                self.skipped_fields.append(skip)
+                list_skips.append(skip)
+            log.warning("         ⚠️  Skipping %s formula field(s) (must be created manually in ClickUp UI):", len(formula_fields))
+            for fname in formula_fields:
+                log.warning("            - %s", fname)
+        
+        if not payloads:
+            return
         
-        if not applicable_fields:
+        # Skip fields an earlier run already created on this list
+        pending = [(name, body) for name, body in payloads if not self._recall("field", list_id, name)]
+        if len(pending) < len(payloads):
+            log.info("         %s custom field(s) already exist from a previous run", len(payloads) - len(pending))
+        if not pending:
             return
         
+        # Fields on a list are independent - create them as one batch
+        log.info("         Adding %s custom fields...", len(pending))
+        field_ids = self.api.create_custom_fields(list_id, [body for _, body in pending])
+        for (name, _), field_id in zip(pending, field_ids):
+            self._remember("field", list_id, name, field_id)
+    
+    def _compile_custom_fields(self, list_type: str) -> Tuple[List[str], List[Tuple[str, bytes]]]:
+        """Names of the formula fields and (name, encoded API body) of the creatable fields
+        that apply to a list type. Every list of a type gets the same fields, so this is
+        computed once per type and the encoded bodies are sent as-is."""
+        if list_type in self._compiled_fields:
+            return self._compiled_fields[list_type]
+        
         # Separate formula fields (not supported by API)
-        creatable_fields = []
         formula_fields = []
-        for field in applicable_fields:
+        payloads = []
+        for field in self._fields_by_list_type.get(list_type, ()):
             if field.get("type") == "formula":
                 formula_fields.append(field["name"])
-                # Track skipped field
-                self.skipped_fields.append({
-                    "space": space_key,
-                    "folder": folder_name,
-                    "list": list_name,
-                    "type": "formula",
-                    "name": field["name"],
-                    "reason": "Formula fields must be created manually in ClickUp UI"
-                })
             else:
-                creatable_fields.append(field)
+                payloads.append((field["name"], _json_dumps(self._field_payload(field))))
         
-        if formula_fields:
-            print(f"         ⚠️  Skipping {len(formula_fields)} formula field(s) (must be created manually in ClickUp UI):")
-            for fname in formula_fields:
-                print(f"            - {fname}")
+        self._compiled_fields[list_type] = (formula_fields, payloads)
+        return formula_fields, payloads
+    
+    @staticmethod
+    def _field_payload(field: Dict) -> Dict:
+        """Translate a config field definition into a ClickUp create-field request body"""
+        field_type = field.get("type", "text")
+        api_field_type = FIELD_TYPE_MAPPING.get(field_type, field_type)
         
-        if not creatable_fields:
-            return
+        # Prepare field data for API - only include fields that ClickUp API accepts
+        field_data = {
+            "name": field["name"],
+            "type": api_field_type
+        }
         
-        print(f"         Adding {len(creatable_fields)} custom fields...")
-        for field in creatable_fields:
-            # Map config field types to ClickUp API field types
-            type_mapping = {
-                "dropdown": "drop_down",
-                "text": "text",
-                "number": "number", 
-                "currency": "currency",
-                "date": "date",
-                "person": "users",
-                "checkbox": "checkbox",
-                "url": "url",
-                "email": "email",
-                "phone": "phone",
-                "location": "location",
-                "rating": "rating",
-                "labels": "labels"
-            }
-            
-            field_type = field.get("type", "text")
-            api_field_type = type_mapping.get(field_type, field_type)
-            
-            # Prepare field data for API - only include fields that ClickUp API accepts
-            field_data = {
-                "name": field["name"],
-                "type": api_field_type
-            }
-            
-            # Initialize type_config if needed for certain field types
-            if api_field_type in ["currency", "number", "drop_down", "labels"]:
+        # Initialize type_config if needed for certain field types
+        if api_field_type in ["currency", "number", "drop_down", "labels"]:
+            field_data["type_config"] = {}
+        
+        # Handle type-specific configs FIRST
+        if field_type == "currency" and "currency" in field:
+            field_data["type_config"]["currency_type"] = field["currency"]
+        
+        if field_type in ["number", "currency"] and "precision" in field:
+            field_data["type_config"]["precision"] = field["precision"]
+        
+        # Add type_config if explicitly present in config
+        if "type_config" in field:
+            # Merge with existing type_config
+            if "type_config" in field_data:
+                field_data["type_config"].update(field["type_config"])
+            else:
+                field_data["type_config"] = field["type_config"]
+        elif "options" in field:
+            # Convert options to proper format for dropdown/labels
+            if "type_config" not in field_data:
                 field_data["type_config"] = {}
-            
-            # Handle type-specific configs FIRST
-            if field_type == "currency" and "currency" in field:
-                field_data["type_config"]["currency_type"] = field["currency"]
-            
-            if field_type in ["number", "currency"] and "precision" in field:
-                field_data["type_config"]["precision"] = field["precision"]
-            
-            # Add type_config if explicitly present in config
-            if "type_config" in field:
-                # Merge with existing type_config
-                if "type_config" in field_data:
-                    field_data["type_config"].update(field["type_config"])
-                else:
-                    field_data["type_config"] = field["type_config"]
-            elif "options" in field:
-                # Convert options to proper format for dropdown/labels
-                if "type_config" not in field_data:
-                    field_data["type_config"] = {}
-                field_data["type_config"]["options"] = []
-                for opt in field["options"]:
-                    if isinstance(opt, dict):
-                        # Already in correct format {name: "...", color: "..."}
-                        option_data = {"name": opt["name"]}
-                        if "color" in opt:
-                            option_data["color"] = opt["color"]
-                        # Note: ClickUp API doesn't support 'description' in dropdown options
-                        field_data["type_config"]["options"].append(option_data)
-                    else:
-                        # Plain string - convert to dict with just name
-                        field_data["type_config"]["options"].append({"name": str(opt)})
-            
-            # Clean up empty type_config
-            if "type_config" in field_data and not field_data["type_config"]:
-                del field_data["type_config"]
-            
-            # Add other API-supported configurations (but NOT applies_to, required_on_close, formula, currency, precision, etc.)
-            if "required" in field:
-                field_data["required"] = field["required"]
-            if "description" in field:
-                field_data["description"] = field["description"]
-            
-            self.api.create_custom_field(list_id, field_data)
-            time.sleep(0.2)
-    
-    def _check_statuses(self, list_id: str, list_type: str) -> bool:
-        """Check if statuses exist for a list based on list type"""
-        statuses_config = self.config.get("statuses", {})
+            # Dicts keep only name/color (ClickUp API doesn't support 'description'
+            # in dropdown options); plain strings become {name: "..."}
+            field_data["type_config"]["options"] = [
+                {key: opt[key] for key in ("name", "color") if key in opt}
+                if isinstance(opt, dict) else {"name": str(opt)}
+                for opt in field["options"]
+            ]
+        
+        # Clean up empty type_config
+        if "type_config" in field_data and not field_data["type_config"]:
+            del field_data["type_config"]
         
-        # Find applicable workflow for this list type
+        # Add other API-supported configurations (but NOT applies_to, required_on_close, formula, currency, precision, etc.)
+        if "required" in field:
+            field_data["required"] = field["required"]
+        if "description" in field:
+            field_data["description"] = field["description"]
+        
+        return field_data
+    
+    @staticmethod
+    def _index_custom_fields(custom_fields_config: Dict) -> Dict[str, List[Dict]]:
+        """Map each list type to the field definitions that apply to it, in config order"""
+        fields_by_list_type = {}
+        for field_category, fields in custom_fields_config.items():
+            if isinstance(fields, list):
+                for field in fields:
+                    for list_type in field.get("applies_to", []):
+                        fields_by_list_type.setdefault(list_type, []).append(field)
+        return fields_by_list_type
+    
+    @staticmethod
+    def _index_workflows(statuses_config: Dict) -> Dict[str, Tuple[str, Tuple[str, ...]]]:
+        """Map each list type to (workflow_key, required status names) of the first
+        workflow that applies to it and defines statuses (status-less ones are skipped)"""
+        workflows = {}
         for workflow_key, workflow_data in statuses_config.items():
             if isinstance(workflow_data, dict):
-                applies_to = workflow_data.get("applies_to", [])
-                if list_type in applies_to:
-                    statuses = workflow_data.get("statuses", [])
-                    if statuses:
-                        print(f"         Checking workflow: {workflow_data.get('workflow_name', workflow_key)}")
-                        return self.api.update_list_statuses(list_id, statuses)
+                required = _status_names(workflow_data.get("statuses", []))
+                if not required:
+                    continue
+                for list_type in workflow_data.get("applies_to", []):
+                    workflows.setdefault(list_type, (workflow_key, required))
+        return workflows
+    
+    def _find_workflow(self, list_type: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """Return (workflow_key, required status names) of the workflow that applies to a list type"""
+        return self._workflows.get(list_type)
+    
+    def _check_statuses(self, list_id: str, list_type: str, space_key: str = "", pending: Optional[Dict] = None,
+                        template_id: str = "") -> bool:
+        """Check if statuses exist for a list based on list type
         
-        return True
+        ``pending`` maps (space_key, workflow_key, template_id) to in-flight
+        find_missing_statuses futures; a list whose check is already running
+        reuses that result.
+        """
+        workflow = self._find_workflow(list_type)
+        if not workflow:
+            return True
+        workflow_key, required = workflow
+        workflow_name = self._statuses_config[workflow_key].get('workflow_name', workflow_key)
+        
+        # Blank lists inherit the space's statuses and template lists their template's,
+        # so one successful check per (space, workflow, template) covers all such lists
+        cache_key = (space_key, workflow_key, template_id)
+        if cache_key in self._verified_workflows:
+            log.info("         Checking workflow: %s (already verified in this space)", workflow_name)
+            return True
+        if cache_key in self._failed_workflows:
+            log.info("         Checking workflow: %s (missing statuses already reported in this space)", workflow_name)
+            return False
+        log.info("         Checking workflow: %s", workflow_name)
+        missing_statuses = None
+        if pending and cache_key in pending:
+            missing_statuses = pending[cache_key].result()
+        if missing_statuses is None:
+            # No prefetch, or the shared GET failed - fetch this list itself
+            missing_statuses = self.api.find_missing_statuses(list_id, required)
+        ok = self.api.report_missing_statuses(missing_statuses)
+        if ok:
+            self._verified_workflows.add(cache_key)
+        elif missing_statuses:
+            # Same reasoning: the space lacks these statuses, so further GETs can't pass
+            self._failed_workflows.add(cache_key)
+        return ok
     
     def _create_views(self, space_id: str, space_key: str):
         """Create views for a space based on config"""
-        views = self.config.get("views", {}).get(space_key, [])
+        views = self._views_config.get(space_key, ())
         
         if not views:
             return
         
-        print(f"\n   📊 Creating Views for {space_key}...")
-        for view_config in views:
-            view_name = view_config.get("name", "Unnamed View")
-            view_type = view_config.get("type", "list")
-            
+        log.info("\n   📊 Creating Views for %s...", space_key)
+        view_names = [view_config.get("name", "Unnamed View") for view_config in views]
+        recalled_ids = [self._recall("view", space_id, view_name) for view_name in view_names]
+        # Views deleted in the UI since the last run are created again
+        live_view_ids = self.api.get_view_ids(space_id) if any(recalled_ids) else None
+        view_payloads = []
+        for view_config, view_name, view_id in zip(views, view_names, recalled_ids):
+            if view_id and live_view_ids is not None and view_id not in live_view_ids:
+                log.info("      View %s (%s) no longer exists - creating it again", view_name, view_id)
+            elif view_id:
+                log.info("      ✓ View already exists from a previous run: %s", view_name)
+                continue
             # Build view data for API
-            view_data = {
+            view_payloads.append({
                 "name": view_name,
-                "type": view_type,
+                "type": view_config.get("type", "list"),
                 "grouping": view_config.get("grouping"),
                 "sorting": view_config.get("sort_by"),
                 "filters": view_config.get("filters", {}),
                 "columns": view_config.get("columns", [])
-            }
-            
-            # Note: Views API has limited support, may need manual creation
-            view_id = self.api.create_view(space_id, view_data)
+            })
+        
+        # Views are independent - create them concurrently (bounded by max_concurrency)
+        # Note: Views API has limited support, may need manual creation
+        view_ids = self.api.run_concurrently(lambda vd: self.api.create_view(space_id, vd), view_payloads)
+        
+        for view_data, view_id in zip(view_payloads, view_ids):
+            view_name, view_type = view_data["name"], view_data["type"]
             if view_id:
-                print(f"      ✓ Created view: {view_name} ({view_type})")
+                self._remember("view", space_id, view_name, view_id)
+                log.info("      ✓ Created view: %s (%s)", view_name, view_type)
             else:
-                print(f"      ℹ️  View '{view_name}' ({view_type}) should be created manually in ClickUp UI")
-            
-            time.sleep(0.3)
+                log.info("      ℹ️  View '%s' (%s) should be created manually in ClickUp UI", view_name, view_type)
     
     def _print_status_summary(self, space_key: str):
         """Print summary of status workflows that need to be created manually"""
-        statuses_config = self.config.get("statuses", {})
+        statuses_config = self._statuses_config
         
-        print(f"\n   📋 Status Workflows Summary for {space_key}:")
-        print(f"      ⚠️  Custom statuses must be created manually in ClickUp UI")
+        log.info("\n   📋 Status Workflows Summary for %s:", space_key)
+        log.warning("      ⚠️  Custom statuses must be created manually in ClickUp UI")
         
         # Count workflows applicable to this space
         workflow_count = 0
@@ -507,152 +1347,184 @@ class WorkspaceBuilder:
                 workflow_name = workflow_data.get('workflow_name', workflow_key)
                 status_count = len(workflow_data.get('statuses', []))
                 workflow_count += 1
-                print(f"      {workflow_count}. {workflow_name}: {status_count} statuses")
+                log.info("      %s. %s: %s statuses", workflow_count, workflow_name, status_count)
         
         if workflow_count > 0:
-            print(f"\n      💡 Refer to config.yaml 'statuses' section for details")
-            print(f"      💡 See docs/STATUS_SETUP_GUIDE.md for step-by-step instructions")
+            log.info("\n      💡 Refer to config.yaml 'statuses' section for details")
+            log.info("      💡 See docs/STATUS_SETUP_GUIDE.md for step-by-step instructions")
 
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
-def main():
+# Fixed text of the final summary, built once at import
+SEPARATOR = "=" * 80
+NEXT_STEPS_TEXT = "\n".join((
+    "\n📋 Next Steps:",
+    "   1. ⚠️  CREATE CUSTOM STATUSES in ClickUp UI",
+    "      - See config.yaml 'statuses' section for all workflows",
+    "      - Multiple workflow types: corrective_maintenance, preventive_maintenance, capex, invoice, warranty",
+    "   2. 📊 CREATE VIEWS in ClickUp UI",
+    "      - See config.yaml 'views' section for recommended configurations",
+    "      - Director Dashboard, Critical Issues Board, Approval Queue, etc.",
+    "   3. 🤖 SET UP AUTOMATIONS (if needed)",
+    "      - Configure task templates and automations manually in ClickUp",
+    "   4. 👥 INVITE TEAM MEMBERS",
+    "      - Configure permissions based on roles (Director, POs, Finance, etc.)",
+    "   5. 📁 START USING THE WORKSPACE",
+    "      - Create tasks using the task templates defined in config.yaml",
+    "   - All custom fields are already configured and ready to use",
+))
+CONFIG_NOTE_TEXT = "\n".join((
+    "\n💡 Configuration File:",
+    "   - All settings are in config.yaml",
+    "   - Modify spaces, folders, lists, fields, statuses, views, and workflows",
+    "   - Re-run script after changes to create newly added items",
+    f"   - Items already created are tracked in {STATE_FILE} and left as they are (see README)",
+))
+FORMULA_FIELDS_TEXT = "\n".join((
+    "\n💡 NEXT STEP: Create formula fields manually in ClickUp UI",
+    "   1. Open each list in ClickUp",
+    "   2. Click on 'Add Field' button",
+    "   3. Select 'Formula' as field type",
+    "   4. Configure the formula as shown in config.yaml",
+))
+
+def main(argv: Optional[List[str]] = None) -> int:
     """
     Main execution function
     
     SETUP INSTRUCTIONS:
     1. Set CLICKUP_API_TOKEN and CLICKUP_TEAM_ID in .env file
     2. Configure workspace structure in config.yaml
-    3. Run: python clickup_python_setup.py
+    3. Run: python clickup_python_setup.py  (add -q to show only warnings/errors during the build)
     
     IMPORTANT NOTES:
     - This script creates: Spaces, Folders, Lists, and Custom Fields
     - Custom statuses CANNOT be created via API (must be done manually)
     - Views, Dashboards, and Automations have limited API support
     - NO EXAMPLES will be created - only the workspace structure
+    
+    EXIT CODES: 0 = success, 1 = build failed, 2 = missing credentials or invalid config.yaml
     """
     
-    # Load environment variables
-    from dotenv import load_dotenv
-    import os   
+    parser = argparse.ArgumentParser(description="Create the ClickUp workspace described in config.yaml")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only show warnings and errors while building (the final summary is always shown)")
+    parser.add_argument("--summary-file", metavar="PATH",
+                        help="also save the final summary to PATH (gzip-compressed if PATH ends in .gz)")
+    args = parser.parse_args(argv)
+    
+    # Progress messages are plain lines on stdout, one write per record
+    # (attached once, so calling main() again doesn't print every line twice)
+    if not log.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+    log.setLevel(logging.WARNING if args.quiet else logging.INFO)
+    log.propagate = False
+    
+    # Load environment variables (.env values never override ones already set)
     load_dotenv()
     
-    API_TOKEN = os.getenv("CLICKUP_API_TOKEN")
-    TEAM_ID = os.getenv("CLICKUP_TEAM_ID")
+    API_TOKEN = os.environ.get("CLICKUP_API_TOKEN")
+    TEAM_ID = os.environ.get("CLICKUP_TEAM_ID")
+    
+    # Fail before any client/config work, naming exactly what is missing
+    missing = [name for name, value in (("CLICKUP_API_TOKEN", API_TOKEN), ("CLICKUP_TEAM_ID", TEAM_ID)) if not value]
+    if missing:
+        print(f"❌ Error: {' and '.join(missing)} must be set in .env file (or the environment)")
+        return 2
     
-    if not API_TOKEN or not TEAM_ID:
-        print("❌ Error: CLICKUP_API_TOKEN and CLICKUP_TEAM_ID must be set in .env file")
-        return
+    HTTP2 = os.environ.get("CLICKUP_HTTP2", "false").strip().lower() in ("1", "true", "yes")
     
     # Initialize
-    config = ClickUpConfig(API_TOKEN, TEAM_ID)
+    config = ClickUpConfig(API_TOKEN, TEAM_ID, http2=HTTP2)
     api = ClickUpAPI(config)
     
-    print("=" * 80)
+    print(SEPARATOR)
     print("CLICKUP WORKSPACE SETUP - PV OPERATIONS MANAGEMENT SYSTEM")
-    print("=" * 80)
+    print(SEPARATOR)
     
-    # Build workspace from YAML config
+    # Load and validate config.yaml - nothing is sent to ClickUp yet
     try:
         builder = WorkspaceBuilder(api, "config.yaml")
-        structure = builder.build_complete_workspace()
-        statuses_verified = builder.statuses_verified
-    except FileNotFoundError as e:
+    except (FileNotFoundError, ValueError, yaml.YAMLError) as e:
+        # Bad or missing config.yaml - nothing was built, no traceback needed
         print(f"❌ Error: {e}")
-        return
+        api.close()
+        return 2
+    
+    # Build workspace from YAML config
+    try:
+        builder.build_complete_workspace()
     except Exception as e:
         print(f"❌ Error building workspace: {e}")
         import traceback
         traceback.print_exc()
-        return
-    
-    # Summary
-    print("\n" + "=" * 80)
-    print("SETUP COMPLETE - SUMMARY")
-    print("=" * 80)
-    print("\n✅ Workspace Structure Created:")
-    print(f"   - {len(structure)} Spaces created")
-    
-    total_folders = sum(len(space_data) for space_data in structure.values())
-    print(f"   - {total_folders} Folders configured")
-    
-    total_lists = sum(
-        len(folder_data.get("lists", {})) 
-        for space_data in structure.values() 
-        for folder_data in space_data.values()
-    )
-    print(f"   - {total_lists} Lists created")
-    print("   - All custom fields applied based on list types")
-    print("   - Status verification completed")
-    
-    print("\n📋 Next Steps:")
-    print("   1. ⚠️  CREATE CUSTOM STATUSES in ClickUp UI")
-    print("      - See config.yaml 'statuses' section for all workflows")
-    print("      - Multiple workflow types: corrective_maintenance, preventive_maintenance, capex, invoice, warranty")
-    print("   2. 📊 CREATE VIEWS in ClickUp UI")
-    print("      - See config.yaml 'views' section for recommended configurations")
-    print("      - Director Dashboard, Critical Issues Board, Approval Queue, etc.")
-    print("   3. 🤖 SET UP AUTOMATIONS (if needed)")
-    print("      - Configure task templates and automations manually in ClickUp")
-    print("   4. 👥 INVITE TEAM MEMBERS")
-    print("      - Configure permissions based on roles (Director, POs, Finance, etc.)")
-    print("   5. 📁 START USING THE WORKSPACE")
-    print("      - Create tasks using the task templates defined in config.yaml")
-    print("   - All custom fields are already configured and ready to use")
-    
-    print("\n💡 Configuration File:")
-    print("   - All settings are in config.yaml")
-    print("   - Modify spaces, folders, lists, fields, statuses, views, and workflows")
-    print("   - Re-run script after changes to update workspace")
-    
-    print("\n" + "=" * 80)
-    print("SKIPPED FIELDS SUMMARY")
-    print("=" * 80)
+        return 1
+    finally:
+        # All API calls are done - release pooled keep-alive connections
+        api.close()
+    
+    # Summary - collected and written in one go rather than one print per line
+    out = []
+    emit = out.append
+    emit("\n" + SEPARATOR)
+    emit("SETUP COMPLETE - SUMMARY")
+    emit(SEPARATOR)
+    emit("\n✅ Workspace Structure:")
+    # Items recalled from .clickup_state.jsonl were not touched by this run
+    for kind in ("spaces", "folders", "lists"):
+        reused = builder.reused[kind]
+        emit(f"   - {builder.counts[kind] - reused} {kind.capitalize()} created, "
+             f"{reused} reused from a previous run")
+    emit("   - All custom fields applied based on list types")
+    emit("   - Status verification completed")
+    
+    emit(NEXT_STEPS_TEXT)
+    emit(CONFIG_NOTE_TEXT)
+    
+    emit("\n" + SEPARATOR)
+    emit("SKIPPED FIELDS SUMMARY")
+    emit(SEPARATOR)
     
     if builder.skipped_fields:
-        # Group skipped fields by space, folder, and list
-        grouped = {}
-        for skip in builder.skipped_fields:
-            space = skip["space"]
-            folder = skip["folder"]
-            list_name = skip["list"]
-            
-            if space not in grouped:
-                grouped[space] = {}
-            if folder not in grouped[space]:
-                grouped[space][folder] = {}
-            if list_name not in grouped[space][folder]:
-                grouped[space][folder][list_name] = []
-            
-            grouped[space][folder][list_name].append(skip)
-        
-        # Print organized summary
+        # Print organized summary (entries are grouped by space/folder/list as they're recorded)
+        grouped = builder.skipped_grouped
         total_skipped = len(builder.skipped_fields)
-        print(f"\n⚠️  Total Skipped Fields: {total_skipped}\n")
-        
-        for space in sorted(grouped.keys()):
-            print(f"📍 Space: {space.upper()}")
-            for folder in sorted(grouped[space].keys()):
-                print(f"   📂 Folder: {folder}")
-                for list_name in sorted(grouped[space][folder].keys()):
-                    print(f"      📋 List: {list_name}")
-                    for field in grouped[space][folder][list_name]:
-                        field_type = field["type"]
-                        field_name = field["name"]
-                        reason = field.get("reason", "Not supported")
-                        print(f"         • {field_type.upper()}: {field_name}")
-                        print(f"           → {reason}")
-        
-        print("\n💡 NEXT STEP: Create formula fields manually in ClickUp UI")
-        print("   1. Open each list in ClickUp")
-        print("   2. Click on 'Add Field' button")
-        print("   3. Select 'Formula' as field type")
-        print("   4. Configure the formula as shown in config.yaml")
+        emit(f"\n⚠️  Total Skipped Fields: {total_skipped}\n")
+        
+        # Walk sorted (key, value) pairs so no level is re-indexed from the top
+        for space, space_folders in sorted(grouped.items()):
+            emit(f"📍 Space: {space.upper()}")
+            for folder, folder_lists in sorted(space_folders.items()):
+                emit(f"   📂 Folder: {folder}")
+                for list_name, fields in sorted(folder_lists.items()):
+                    emit(f"      📋 List: {list_name}")
+                    # One chunk per list instead of two emits per field
+                    emit("\n".join(
+                        f"         • {field['type'].upper()}: {field['name']}\n"
+                        f"           → {field.get('reason', 'Not supported')}"
+                        for field in fields
+                    ))
+        
+        emit(FORMULA_FIELDS_TEXT)
     else:
-        print("✅ No fields were skipped - all custom fields created successfully!")
+        emit("✅ No fields were skipped - all custom fields created successfully!")
     
-    print("\n" + "=" * 80)
+    emit("\n" + SEPARATOR)
+    summary = "\n".join(out) + "\n"
+    sys.stdout.write(summary)
+    if args.summary_file:
+        # e.g. for CI to upload as an artifact without scraping the build log
+        opener = gzip.open if args.summary_file.endswith(".gz") else open
+        try:
+            with opener(args.summary_file, "wt", encoding="utf-8") as f:
+                f.write(summary)
+        except OSError as e:
+            print(f"⚠️  Could not write summary file {args.summary_file}: {e}")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())